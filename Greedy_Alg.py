@@ -1,11 +1,23 @@
+import heapq
+import itertools
+
+import numpy as np
+
 from Node import Node
 
+# Latin-1 bytes kept, and deleted, by filter_uppercase_and_spaces
+KEEP_BYTES = bytes(range(ord("A"), ord("Z") + 1)) + b" "
+DELETE_BYTES = bytes(i for i in range(256) if i not in KEEP_BYTES)
+
 def filter_uppercase_and_spaces(input_string: str) -> str:
     """
     Filters the input string to retain only uppercase letters and spaces.
     """
-    return "".join(
-        char for char in input_string.upper() if char.isalpha() or char == " "
+    return (
+        input_string.upper()
+        .encode("latin-1", "ignore")
+        .translate(None, DELETE_BYTES)
+        .decode("latin-1")
     )
 
 def count_frequencies(input_string: str) -> list[int]:
@@ -16,36 +28,28 @@ def count_frequencies(input_string: str) -> list[int]:
     And that spaces are the most frequent character, so really we dont need
     to count them.
     """
-    frequencies = [0] * 27
-    for char in input_string:
-        if char == " ":
-            frequencies[26] += 1 
-        else:
-            index = ord(char) - ord("A")
-            frequencies[index] += 1
-    return frequencies
-
+    counts = np.bincount(
+        np.frombuffer(input_string.encode("latin-1"), dtype=np.uint8), minlength=256
+    )
+    return counts[ord("A") : ord("Z") + 1].tolist() + [int(counts[ord(" ")])]
 
 
-def initialize_forest(frequencies: list[int]) -> list[Node]:
+def initialize_forest(frequencies: list[int]) -> list[tuple[int, int, Node]]:
     """
-    Initializes a forest (list) of Node objects for each character with a non-zero frequency.
+    Initializes a forest of Node objects for each character with a non-zero frequency.
+    The forest is a heapq min-heap of (frequency, tiebreaker, node) entries; the
+    tiebreaker is the symbol's index, so Node objects are never compared directly.
     """
     forest = []
     for i, freq in enumerate(frequencies):
         if freq > 0:
             symbol = " " if i ==26 else chr(i + ord("A"))
-            forest.append(Node(freq, symbol))
+            forest.append((freq, i, Node(freq, symbol)))
+    heapq.heapify(forest)
     return forest
 
-def get_smallest(forest: list[Node]) -> Node:
-    smallest_index = 0
-    for i in range(1, len(forest)):
-        if forest[i] < forest[smallest_index]:
-            smallest_index = i
-    return forest.pop(smallest_index)
-
 
+# Kept on Node objects, not parallel arrays: the notebook's signatures take and return Node
 def build_huffman_tree(frequencies: list[int]) -> Node:
     """
     Builds the Huffman tree from the list of frequencies and returns the root Node.
@@ -53,20 +57,28 @@ def build_huffman_tree(frequencies: list[int]) -> Node:
     forest = initialize_forest(frequencies)
     if len(forest) == 0:
         return None # Handle empty input
-
+    if len(forest) == 1:
+        # Single symbol: hang the leaf under a root so it gets code "0"
+        freq, _, leaf = forest[0]
+        root = Node(freq)
+        root.left = leaf
+        return root
+
+    # Tiebreakers for internal nodes start after the leaf indices
+    counter = itertools.count(len(frequencies))
     while len(forest) > 1:
         # Extract two smallest nodes
-        s1 = get_smallest(forest)
-        s2 = get_smallest(forest)
+        f1, _, s1 = heapq.heappop(forest)
+        f2, _, s2 = heapq.heappop(forest)
 
         # Create a new internal node
-        new_node = Node(s1.get_frequency()+s2.get_frequency())
-        new_node.set_left(s1)
-        new_node.set_right(s2)
+        new_node = Node(f1 + f2)
+        new_node.left = s1
+        new_node.right = s2
 
-        forest.append(new_node)
+        heapq.heappush(forest, (f1 + f2, next(counter), new_node))
 
-    return forest[0] # Root of Huffman Tree
+    return forest[0][2] # Root of Huffman Tree
 
 
 def build_encoding_table(huffman_tree_root: Node) -> list[str]:
@@ -78,21 +90,21 @@ def build_encoding_table(huffman_tree_root: Node) -> list[str]:
     """
     table = [""] * 27
 
-    def traverse(node: Node, code: str):
+    def traverse(node: Node, code_int: int = 0, length: int = 0):
         if node is None:
             return
-        if node.get_symbol() is not None:
-            # Leaf node: assign code
-            symbol = node.get_symbol()
+        if node.symbol is not None:
+            # Leaf node: assign code, stringified only here
+            symbol = node.symbol
             index = 26 if symbol == " " else ord(symbol) - ord("A")
-            table[index] = code
+            table[index] = format(code_int, f"0{length}b")
             return
     
         #Traverse left and right
-        traverse(node.get_left(), code + "0")
-        traverse(node.get_right(), code + "1")
+        traverse(node.left, code_int << 1, length + 1)
+        traverse(node.right, (code_int << 1) | 1, length + 1)
 
-    traverse(huffman_tree_root, "")
+    traverse(huffman_tree_root)
     return table
 
 def encode(input_string: str, encoding_table: list[str]) -> str:
@@ -101,14 +113,10 @@ def encode(input_string: str, encoding_table: list[str]) -> str:
     that the encoding table has 27 entries, one for each letter A-Z and
     one for space. Space is at the last index (26).
     """
-    encoded = []
-    for char in input_string:
-        if char == " ":
-            encoded.append(encoding_table[26])
-        else:
-            index = ord(char) - ord("A")
-            encoded.append(encoding_table[index])
-    return "".join(encoded)
+    lookup = {" ": encoding_table[26]}
+    for index in range(26):
+        lookup[chr(ord("A") + index)] = encoding_table[index]
+    return "".join(map(lookup.__getitem__, input_string))
 
 
 def decode(encoded_string: str, huffman_root: Node) -> str:
@@ -120,12 +128,12 @@ def decode(encoded_string: str, huffman_root: Node) -> str:
 
     for bit in encoded_string:
         if bit == "0":
-            current = current.get_left()
+            current = current.left
         elif bit == "1":
-            current = current.get_right()
+            current = current.right
         
-        if current.get_symbol() is not None:
-            decoded.append(current.get_symbol())
+        if current.symbol is not None:
+            decoded.append(current.symbol)
             current = huffman_root
     return "".join(decoded)
 
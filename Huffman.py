@@ -2,125 +2,228 @@
 # Huffman Encoding in Python
 # ==========================
 
-# ----- Node Class -----
-class Node:
-    """Simple binary tree node for Huffman encoding"""
+from collections import deque
 
-    def __init__(self, frequency: int, symbol: str | None = None):
-        """Initialize a new node."""
-        self.__frequency = frequency
-        self.__symbol = symbol
-        self.__left = None
-        self.__right = None
+import numpy as np
 
-    # -- Setters -- #
-    def set_left(self, child) -> None:
-        self.__left = child
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda function: function
 
-    def set_right(self, child) -> None:
-        self.__right = child
+try:
+    from huffman_decode import decode as _c_decode
+except ImportError:  # C extension not built; see setup.py
+    _c_decode = None
 
-    # -- Getters -- #
-    def get_frequency(self) -> int:
-        return self.__frequency
 
-    def get_symbol(self) -> str:
-        return self.__symbol
+# ----- Node Class -----
+class Node:
+    """Simple binary tree node for Huffman encoding, built by tree_to_node for printing"""
 
-    def get_left(self):
-        return self.__left
+    __slots__ = ("frequency", "symbol", "left", "right")
 
-    def get_right(self):
-        return self.__right
+    def __init__(self, frequency: int, symbol: str | None = None):
+        """Initialize a new node."""
+        self.frequency = frequency
+        self.symbol = symbol
+        self.left = None
+        self.right = None
 
     # -- Overloaded operators -- #
     def __str__(self) -> str:
-        return f"({self.__symbol}:{self.__frequency})"
+        return f"({self.symbol}:{self.frequency})"
 
     def __repr__(self) -> str:
         return self.__str__()
 
-    def __lt__(self, other: "Node") -> bool:
-        return self.__frequency < other.__frequency
+
+# ----- Bit I/O Classes -----
+class BitWriter:
+    """Packs variable-length codes MSB-first into a bytearray."""
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.cur = 0
+        self.nbits = 0
+        self.total_bits = 0
+
+    def write(self, code: int, length: int) -> None:
+        """Append the low `length` bits of `code`."""
+        self.cur = (self.cur << length) | code
+        self.nbits += length
+        self.total_bits += length
+        while self.nbits >= 8:
+            self.nbits -= 8
+            self.buf.append((self.cur >> self.nbits) & 0xFF)
+        self.cur &= (1 << self.nbits) - 1
+
+    def to_bytes(self) -> bytes:
+        """Return the packed bits, zero-padding the final byte."""
+        tail = bytes([(self.cur << (8 - self.nbits)) & 0xFF]) if self.nbits else b""
+        return bytes(self.buf) + tail
+
+
+class BitReader:
+    """Reads bits MSB-first from a packed buffer, refilling 32 bits at a time."""
+
+    def __init__(self, buf: bytes, nbits: int):
+        self.buf = buf
+        self.pos = 0
+        self.word = 0
+        self.wordbits = 0
+        self.bits_left = nbits
+
+    def peek(self, n: int) -> int:
+        """Return the next n bits without consuming them, zero-padded past the end."""
+        while self.wordbits < n:
+            chunk = self.buf[self.pos:self.pos + 4]
+            self.pos += 4
+            padded = int.from_bytes(chunk, "big") << (8 * (4 - len(chunk)))
+            self.word = (self.word << 32) | padded
+            self.wordbits += 32
+        return (self.word >> (self.wordbits - n)) & ((1 << n) - 1)
+
+    def advance(self, n: int) -> None:
+        """Consume n bits previously returned by peek."""
+        self.wordbits -= n
+        self.word &= (1 << self.wordbits) - 1
+        self.bits_left -= n
 
 
 # ----- Constants -----
 ASCII_SYMBOLS = 256
+LUT_BITS = 8
+LUT_SIZE = 1 << LUT_BITS
+KEEP_BYTES = bytes(range(ord("A"), ord("Z") + 1)) + b" "
+DELETE_BYTES = bytes(i for i in range(ASCII_SYMBOLS) if i not in KEEP_BYTES)
 
 
 # ----- Step 1: Filter input -----
+def _filtered_bytes(input_string):
+    """Return the latin-1 bytes of input_string that are ASCII A-Z or space.
+
+    Latin-1 capitals such as 'É' are dropped, as is anything outside latin-1.
+    """
+    return input_string.encode("latin-1", "ignore").translate(None, DELETE_BYTES)
+
+
 def filter_uppercase_and_spaces(input_string):
     """Keep only uppercase letters and spaces."""
-    return ''.join([char for char in input_string if char.isupper() or char == ' '])
+    return _filtered_bytes(input_string).decode("latin-1")
 
 
 # ----- Step 2: Frequency of symbols -----
+def _count_bytes(message_bytes):
+    """Return a list of frequencies for all ASCII values in a bytes-like object."""
+    symbols = np.frombuffer(message_bytes, dtype=np.uint8)
+    return np.bincount(symbols, minlength=ASCII_SYMBOLS).tolist()
+
+
 def frequency_of_symbols(message: str) -> list[int]:
     """Return a list of frequencies for all ASCII characters."""
-    frequencies = [0] * ASCII_SYMBOLS
-    for char in message:
-        ascii_value = ord(char)
-        frequencies[ascii_value] += 1
-    return frequencies
+    return _count_bytes(message.encode("latin-1"))
+
+
+def filter_and_count(input_string):
+    """Filter the input and count its symbols from the same byte buffer.
+
+    Returns (filtered_message, frequencies), saving the re-encode that calling
+    filter_uppercase_and_spaces and frequency_of_symbols separately costs.
+    """
+    kept = _filtered_bytes(input_string)
+    return kept.decode("latin-1"), _count_bytes(kept)
 
 
 # ----- Step 3: Create initial forest -----
 def create_forest(frequencies):
-    """Create a list of leaf nodes for characters that appear at least once."""
-    forest = []
+    """Create one leaf per character that appears at least once.
+
+    Nodes are stored structure-of-arrays style as (frequency, symbol, left, right)
+    lists indexed by node id. Leaves get ids 0..n-1 and -1 children.
+    """
+    frequency, symbol, left, right = [], [], [], []
     for ascii_val in range(len(frequencies)):
         if frequencies[ascii_val] > 0:
-            forest.append(Node(frequencies[ascii_val], chr(ascii_val)))
-    return forest
-
-
-# ----- Step 4: Get smallest node -----
-def get_smallest(forest):
-    """Pop and return the smallest node in the forest."""
-    smallest_index = 0
-    for i in range(1, len(forest)):
-        if forest[i] < forest[smallest_index]:
-            smallest_index = i
-    return forest.pop(smallest_index)
+            frequency.append(frequencies[ascii_val])
+            symbol.append(chr(ascii_val))
+            left.append(-1)
+            right.append(-1)
+    return frequency, symbol, left, right
 
 
-# ----- Step 5: Build Huffman tree -----
+# ----- Step 4/5: Build Huffman tree -----
 def huffman(forest):
-    """Build the Huffman tree from the initial forest."""
-    if len(forest) == 0:
+    """Build the Huffman tree from the initial forest.
+
+    Internal nodes are appended to the forest arrays; internal nodes have symbol
+    None. Returns the tree as (frequency, symbol, left, right, root_id).
+    """
+    frequency, symbol, left, right = forest
+    if len(frequency) == 0:
         return None
-    while len(forest) > 1:
-        s1 = get_smallest(forest)
-        s2 = get_smallest(forest)
-        new_node = Node(s1.get_frequency() + s2.get_frequency())
-        new_node.set_left(s1)
-        new_node.set_right(s2)
-        forest.append(new_node)
-    return forest[0]  # Root node
+    if len(frequency) == 1:
+        # Single symbol: give the leaf a parent so its code is "0", not "".
+        # Both children point at it so every decoder stays in bounds.
+        frequency.append(frequency[0])
+        symbol.append(None)
+        left.append(0)
+        right.append(0)
+        return frequency, symbol, left, right, 1
+    # Two-queue construction: leaves sorted once, merged nodes come out of
+    # the FIFO already in ascending order, so no heap is needed.
+    leaves = deque(sorted(range(len(frequency)), key=frequency.__getitem__))
+    merged = deque()
+
+    def pop_smallest():
+        if not merged or (leaves and frequency[leaves[0]] <= frequency[merged[0]]):
+            return leaves.popleft()
+        return merged.popleft()
+
+    for new_id in range(len(frequency), 2 * len(frequency) - 1):
+        id1 = pop_smallest()
+        id2 = pop_smallest()
+        frequency.append(frequency[id1] + frequency[id2])
+        symbol.append(None)
+        left.append(id1)
+        right.append(id2)
+        merged.append(new_id)
+    return frequency, symbol, left, right, merged[0]
 
 
 # ----- Step 6: Build encoding table -----
-def build_encoding_table(root):
-    """Generate a dictionary mapping symbols to Huffman codes."""
+def build_code_table(tree):
+    """Generate a dictionary mapping symbols to (code_int, length) Huffman codes."""
     table = {}
-
-    def traverse(node, current_code=""):
-        if node is None:
-            return
-        if node.get_symbol() is not None:
-            table[node.get_symbol()] = current_code
+    if tree is None:
+        return table
+    _, symbol, left, right, root = tree
+
+    def traverse(node_id, code_int=0, length=0):
+        if symbol[node_id] is not None:
+            # setdefault keeps "0" for the single-symbol root's shared child
+            table.setdefault(symbol[node_id], (code_int, length))
             return
-        traverse(node.get_left(), current_code + "0")
-        traverse(node.get_right(), current_code + "1")
+        traverse(left[node_id], code_int << 1, length + 1)
+        traverse(right[node_id], (code_int << 1) | 1, length + 1)
 
     traverse(root)
     return table
 
 
+def build_encoding_table(tree):
+    """Generate a dictionary mapping symbols to Huffman codes."""
+    return {
+        symbol: format(code_int, f"0{length}b")
+        for symbol, (code_int, length) in build_code_table(tree).items()
+    }
+
+
 # ----- Step 7: Encode using table -----
 def encode_with_table(message, table):
     """Encode a message using the precomputed Huffman table."""
-    return ''.join(table[char] for char in message)
+    return ''.join(map(table.__getitem__, message))
 
 
 # ----- Step 8: Build reverse table -----
@@ -144,24 +247,251 @@ def decode_with_table(encoded_message, reverse_table):
     return ''.join(decoded)
 
 
+# ----- Step 10: Materialize Node objects -----
+def tree_to_node(tree):
+    """Convert the tree arrays into linked Node objects, e.g. for printing."""
+    if tree is None:
+        return None
+    frequency, symbol, left, right, root = tree
+
+    def build(node_id):
+        node = Node(frequency[node_id], symbol[node_id])
+        if symbol[node_id] is None:
+            node.left = build(left[node_id])
+            node.right = build(right[node_id])
+        return node
+
+    return build(root)
+
+
+# ----- Step 11: Decode by walking the tree arrays -----
+def decode_with_tree(encoded_message, tree):
+    """Decode an encoded message by walking the tree arrays bit by bit."""
+    _, symbol, left, right, root = tree
+    decoded = []
+    current = root
+
+    for bit in encoded_message:
+        current = left[current] if bit == "0" else right[current]
+        if symbol[current] is not None:
+            decoded.append(symbol[current])
+            current = root
+
+    return ''.join(decoded)
+
+
+# ----- Step 12: Canonical codes -----
+def build_canonical_table(table):
+    """Reassign codes canonically, keeping each symbol's code length.
+
+    Symbols are ordered by (length, symbol) and given consecutive codes, so the
+    code lengths alone are enough to rebuild the table.
+    """
+    canonical = {}
+    code = 0
+    previous_length = 0
+    for symbol, length in sorted(((s, len(c)) for s, c in table.items()),
+                                 key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        canonical[symbol] = format(code, f"0{length}b")
+        code += 1
+        previous_length = length
+    return canonical
+
+
+# ----- Step 13: Decoding lookup table -----
+def build_decode_lut(table):
+    """Build a multi-level LUT_BITS-wide lookup table from a prefix-code table.
+
+    Returns (lut_symbol, lut_length) lists made of LUT_SIZE-entry blocks; block 0
+    is the first level. An entry with length > 0 decodes symbol lut_symbol[i]
+    from that many bits. An entry with length 0 consumes LUT_BITS bits and
+    continues in block lut_symbol[i].
+    """
+    lut_symbol = [0] * LUT_SIZE
+    lut_length = [0] * LUT_SIZE
+    for symbol, code in table.items():
+        block = 0
+        remaining = code
+        while len(remaining) > LUT_BITS:
+            index = block * LUT_SIZE + int(remaining[:LUT_BITS], 2)
+            # Block 0 is never a continuation, so a zero entry is unallocated
+            if lut_length[index] == 0 and lut_symbol[index] == 0:
+                lut_symbol[index] = len(lut_symbol) // LUT_SIZE
+                lut_symbol.extend([0] * LUT_SIZE)
+                lut_length.extend([0] * LUT_SIZE)
+            block = lut_symbol[index]
+            remaining = remaining[LUT_BITS:]
+        free_bits = LUT_BITS - len(remaining)
+        first = block * LUT_SIZE + (int(remaining, 2) << free_bits)
+        for index in range(first, first + (1 << free_bits)):
+            lut_symbol[index] = ord(symbol)
+            lut_length[index] = len(remaining)
+    return lut_symbol, lut_length
+
+
+# ----- Step 14: Build bit table -----
+def build_bit_table(table):
+    """Convert a '0'/'1' code table into symbol -> (code_int, length)."""
+    return {symbol: (int(code, 2), len(code)) for symbol, code in table.items()}
+
+
+# ----- Step 15: Encode into packed bits -----
+def encode_packed(message, bit_table):
+    """Encode a message into packed bytes. Returns (packed_bytes, bit_count)."""
+    writer = BitWriter()
+    for char in message:
+        writer.write(*bit_table[char])
+    return writer.to_bytes(), writer.total_bits
+
+
+def pack_bits(encoded_message):
+    """Pack a '0'/'1' string into MSB-first bytes, zero-padding the final byte.
+
+    The whole string is parsed as one base-2 int, so the conversion runs in C
+    and the result can go straight to the packed decoders.
+    """
+    if not encoded_message:
+        return b""
+    pad = -len(encoded_message) % 8
+    return (int(encoded_message, 2) << pad).to_bytes((len(encoded_message) + pad) // 8, "big")
+
+
+# ----- Step 16: Decode with the lookup table -----
+def decode_with_lut(packed, n_out, lut):
+    """Decode n_out symbols from packed bits, LUT_BITS at a time, using the lookup table."""
+    lut_symbol, lut_length = lut
+    reader = BitReader(packed, 8 * len(packed))
+    decoded = bytearray(n_out)
+    count = 0
+    block = 0
+
+    while count < n_out:
+        index = block * LUT_SIZE + reader.peek(LUT_BITS)
+        if (lut_length[index] or LUT_BITS) > reader.bits_left:
+            raise ValueError(f"packed bits end before {n_out} symbols")
+        if lut_length[index] == 0:
+            block = lut_symbol[index]
+            reader.advance(LUT_BITS)
+        else:
+            decoded[count] = lut_symbol[index]
+            count += 1
+            reader.advance(lut_length[index])
+            block = 0
+
+    return decoded.decode("latin-1")
+
+
+# ----- Step 17: Compiled tree-walk decode -----
+@njit(cache=True)
+def _decode_tree_u8(packed, left, right, symbol, root, out):
+    """Walk the tree arrays over packed bits until out is full.
+
+    Returns the number of symbols written, which is short of out.size only
+    if the packed bits run out first.
+    """
+    count = 0
+    current = root
+    i = 0
+    while count < out.size and i < 8 * packed.size:
+        bit = (packed[i >> 3] >> (7 - (i & 7))) & 1
+        current = right[current] if bit else left[current]
+        if symbol[current] >= 0:
+            out[count] = symbol[current]
+            count += 1
+            current = root
+        i += 1
+    return count
+
+
+def decode_packed(packed, n_out, tree):
+    """Decode n_out symbols with the C extension if built, else the compiled tree walk."""
+    _, symbol, left, right, root = tree
+    left = np.array(left, dtype=np.int32)
+    right = np.array(right, dtype=np.int32)
+    symbol = np.array([-1 if s is None else ord(s) for s in symbol], dtype=np.int32)
+    if _c_decode is not None:
+        return _c_decode(packed, n_out, left, right, symbol, root).decode("latin-1")
+    decoded = bytearray(n_out)
+    out = np.frombuffer(decoded, dtype=np.uint8)
+    count = _decode_tree_u8(
+        np.frombuffer(packed, dtype=np.uint8), left, right, symbol, root, out
+    )
+    if count < n_out:
+        raise ValueError(f"packed bits end before {n_out} symbols")
+    return decoded.decode("latin-1")
+
+
+# ----- Step 18: Compiled lookup-table decode -----
+@njit(cache=True)
+def _decode_lut_u8(packed, lut_symbol, lut_length, out):
+    """Decode packed bits through the lookup table until out is full.
+
+    Bytes are shifted into a bit window, and each lookup consumes one code
+    (or LUT_BITS bits when it continues into another block). Returns the
+    number of symbols written, which is short of out.size only if the packed
+    bits run out first.
+    """
+    count = 0
+    window = 0
+    window_bits = 0
+    position = 0
+    consumed = 0
+    block = 0
+    while count < out.size and consumed < 8 * packed.size:
+        while window_bits <= 24:
+            byte = int(packed[position]) if position < packed.size else 0
+            window = (window << 8) | byte
+            window_bits += 8
+            position += 1
+        index = block * LUT_SIZE + ((window >> (window_bits - LUT_BITS)) & (LUT_SIZE - 1))
+        length = int(lut_length[index])
+        if length == 0:
+            length = LUT_BITS
+        if consumed + length > 8 * packed.size:
+            break  # the code runs into the zero padding
+        if lut_length[index] == 0:
+            block = lut_symbol[index]
+        else:
+            out[count] = lut_symbol[index]
+            count += 1
+            block = 0
+        window_bits -= length
+        window &= (1 << window_bits) - 1
+        consumed += length
+    return count
+
+
+def decode_packed_lut(packed, n_out, lut):
+    """Decode n_out symbols with the compiled lookup-table decoder."""
+    lut_symbol, lut_length = lut
+    decoded = bytearray(n_out)
+    count = _decode_lut_u8(
+        np.frombuffer(packed, dtype=np.uint8),
+        np.array(lut_symbol, dtype=np.int32),
+        np.array(lut_length, dtype=np.int32),
+        np.frombuffer(decoded, dtype=np.uint8),
+    )
+    if count < n_out:
+        raise ValueError(f"packed bits end before {n_out} symbols")
+    return decoded.decode("latin-1")
+
+
 # ==========================
 # Run Example
 # ==========================
 if __name__ == "__main__":
     message_to_compress = "HELLO WORLD"
 
-    # Step A: Filter the message
-    filtered_message = filter_uppercase_and_spaces(message_to_compress)
-
-    # Step B: Build frequency table
-    frequencies = frequency_of_symbols(filtered_message)
+    # Step A/B: Filter the message and build its frequency table
+    filtered_message, frequencies = filter_and_count(message_to_compress)
 
     # Step C: Build forest and Huffman tree
     forest = create_forest(frequencies)
-    tree_root = huffman(forest)
+    tree = huffman(forest)
 
     # Step D: Build encoding table
-    encoding_table = build_encoding_table(tree_root)
+    encoding_table = build_encoding_table(tree)
     print("Encoding Table:", encoding_table)
 
     # Step E: Encode the message
@@ -173,6 +503,23 @@ if __name__ == "__main__":
     decoded_message = decode_with_table(encoded_message, reverse_table)
     print("Decoded Message:", decoded_message)
 
+    # Step G: Decode by walking the tree arrays
+    assert decode_with_tree(encoded_message, tree) == decoded_message
+
+    # Step H: Canonical codes decoded through the lookup table
+    canonical_table = build_canonical_table(encoding_table)
+    packed, bit_count = encode_packed(filtered_message, build_bit_table(canonical_table))
+    print("Packed Message:", packed.hex(), f"({bit_count} bits)")
+    lut = build_decode_lut(canonical_table)
+    message_length = sum(frequencies)
+    assert decode_with_lut(packed, message_length, lut) == decoded_message
+    assert decode_packed_lut(packed, message_length, lut) == decoded_message
+
+    # Step I: Compiled decode of the packed bits
+    packed, _ = encode_packed(filtered_message, build_code_table(tree))
+    assert packed == pack_bits(encoded_message)
+    assert decode_packed(packed, message_length, tree) == decoded_message
+
     # Verify correctness
     assert decoded_message == filtered_message, "Decoding failed!"
     print("Compression and Decompression successful!")
@@ -0,0 +1,137 @@
+/*
+ * C tree-walk decoder for Huffman.py.
+ *
+ * Build in place with:  python setup.py build_ext --inplace
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+/* decode(packed, n_out, left, right, symbol, root) -> bytes
+ *
+ * packed is the MSB-first bitstream, any contiguous bytes-like object.
+ * left, right and symbol are contiguous int32 buffers (e.g. numpy int32
+ * arrays) indexed by node id, with symbol < 0 marking internal nodes and leaf
+ * symbols in 0..255. root must be an internal node.
+ */
+static int
+get_int32_buffer(PyObject *obj, Py_buffer *view, const char *name)
+{
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0) {
+        return -1;
+    }
+    const char *format = view->format;
+    if (format[0] == '=' || format[0] == '<' || format[0] == '@') {
+        format++;
+    }
+    if (view->itemsize != 4 || (strcmp(format, "i") != 0 && strcmp(format, "l") != 0)) {
+        PyErr_Format(PyExc_TypeError, "%s must be an int32 buffer, not format '%s'",
+                     name, view->format);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+decode(PyObject *self, PyObject *args)
+{
+    Py_buffer packed;
+    Py_buffer left_buf = {0}, right_buf = {0}, sym_buf = {0};
+    PyObject *left_obj, *right_obj, *sym_obj;
+    Py_ssize_t n_out;
+    int root;
+    PyObject *result = NULL;
+
+    if (!PyArg_ParseTuple(args, "y*nOOOi", &packed, &n_out, &left_obj,
+                          &right_obj, &sym_obj, &root)) {
+        return NULL;
+    }
+    if (get_int32_buffer(left_obj, &left_buf, "left") < 0 ||
+        get_int32_buffer(right_obj, &right_buf, "right") < 0 ||
+        get_int32_buffer(sym_obj, &sym_buf, "symbol") < 0) {
+        goto done;
+    }
+    const uint8_t *bits = packed.buf;
+    const int32_t *left = left_buf.buf;
+    const int32_t *right = right_buf.buf;
+    const int32_t *sym = sym_buf.buf;
+    Py_ssize_t nodes = sym_buf.len / 4;
+
+    if (n_out < 0) {
+        PyErr_SetString(PyExc_ValueError, "n_out must be non-negative");
+        goto done;
+    }
+    if (left_buf.len != sym_buf.len || right_buf.len != sym_buf.len) {
+        PyErr_SetString(PyExc_ValueError, "tree arrays must have equal length");
+        goto done;
+    }
+    if (root < 0 || root >= nodes) {
+        PyErr_SetString(PyExc_ValueError, "root is not a node id");
+        goto done;
+    }
+    if (sym[root] >= 0) {
+        PyErr_SetString(PyExc_ValueError, "root must be an internal node");
+        goto done;
+    }
+    for (Py_ssize_t n = 0; n < nodes; n++) {
+        if (sym[n] > 255) {
+            PyErr_SetString(PyExc_ValueError, "symbol does not fit in a byte");
+            goto done;
+        }
+        if (sym[n] < 0 && (left[n] < 0 || left[n] >= nodes ||
+                           right[n] < 0 || right[n] >= nodes)) {
+            PyErr_SetString(PyExc_ValueError, "child is not a node id");
+            goto done;
+        }
+    }
+
+    result = PyBytes_FromStringAndSize(NULL, n_out);
+    if (result == NULL) {
+        goto done;
+    }
+    char *out = PyBytes_AS_STRING(result);
+    Py_ssize_t o = 0;
+    Py_ssize_t nbits = packed.len * 8;
+    int32_t cur = root;
+
+    for (Py_ssize_t i = 0; o < n_out && i < nbits; i++) {
+        cur = (bits[i >> 3] >> (7 - (i & 7))) & 1 ? right[cur] : left[cur];
+        int32_t s = sym[cur];
+        if (s >= 0) {
+            out[o++] = (char)s;
+            cur = root;
+        }
+    }
+
+    if (o < n_out) {
+        Py_CLEAR(result);
+        PyErr_Format(PyExc_ValueError, "packed bits end before %zd symbols", n_out);
+    }
+
+done:
+    PyBuffer_Release(&packed);
+    PyBuffer_Release(&left_buf);
+    PyBuffer_Release(&right_buf);
+    PyBuffer_Release(&sym_buf);
+    return result;
+}
+
+static PyMethodDef huffman_decode_methods[] = {
+    {"decode", decode, METH_VARARGS,
+     "decode(packed, n_out, left, right, symbol, root) -> bytes\n\n"
+     "Decode n_out symbols by walking int32 tree arrays over an MSB-first\n"
+     "packed bitstream."},
+    {NULL, NULL, 0, NULL},
+};
+
+static struct PyModuleDef huffman_decode_module = {
+    PyModuleDef_HEAD_INIT, "huffman_decode", NULL, -1, huffman_decode_methods,
+};
+
+PyMODINIT_FUNC
+PyInit_huffman_decode(void)
+{
+    return PyModule_Create(&huffman_decode_module);
+}
@@ -0,0 +1,8 @@
+from setuptools import Extension, setup
+
+# Optional C decoder used by Huffman.decode_packed:
+#   python setup.py build_ext --inplace
+setup(
+    name="huffman_decode",
+    ext_modules=[Extension("huffman_decode", ["huffman_decode.c"])],
+)
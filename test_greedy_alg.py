@@ -0,0 +1,36 @@
+import Greedy_Alg
+
+
+def test_single_symbol_round_trip():
+    frequencies = Greedy_Alg.count_frequencies("AAAA")
+    root = Greedy_Alg.build_huffman_tree(frequencies)
+    table = Greedy_Alg.build_encoding_table(root)
+    assert table[0] == "0"
+    encoded = Greedy_Alg.encode("AAAA", table)
+    assert encoded == "0000"
+    assert Greedy_Alg.decode(encoded, root) == "AAAA"
+
+
+def test_end_to_end_round_trip():
+    filtered = Greedy_Alg.filter_uppercase_and_spaces("Héllo, Wörld! É 42 the quick fox")
+    assert filtered == "HLLO WRLD   THE QUICK FOX"
+
+    frequencies = Greedy_Alg.count_frequencies(filtered)
+    assert len(frequencies) == 27
+    assert frequencies[ord("L") - ord("A")] == 3
+    assert frequencies[26] == filtered.count(" ")
+
+    root = Greedy_Alg.build_huffman_tree(frequencies)
+    table = Greedy_Alg.build_encoding_table(root)
+    codes = [code for code in table if code]
+    assert not any(a != b and b.startswith(a) for a in codes for b in codes)
+    encoded = Greedy_Alg.encode(filtered, table)
+    # An optimal code's length is the sum of the Huffman merge weights
+    expected = 0
+    weights = sorted(f for f in frequencies if f)
+    while len(weights) > 1:
+        total = weights.pop(0) + weights.pop(0)
+        expected += total
+        weights = sorted(weights + [total])
+    assert len(encoded) == expected
+    assert Greedy_Alg.decode(encoded, root) == filtered
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import Huffman
+
+
+def test_filter_and_count_matches_separate_steps():
+    message = "Hello, World! ÉÀ 123"
+    filtered, frequencies = Huffman.filter_and_count(message)
+    assert filtered == Huffman.filter_uppercase_and_spaces(message) == "H W  "
+    assert frequencies == Huffman.frequency_of_symbols(filtered)
+
+
+def _packed(message):
+    """Return (packed, tree, lut) for a message, with LUT codes canonical."""
+    tree = Huffman.huffman(Huffman.create_forest(Huffman.frequency_of_symbols(message)))
+    canonical = Huffman.build_canonical_table(Huffman.build_encoding_table(tree))
+    packed, _ = Huffman.encode_packed(message, Huffman.build_bit_table(canonical))
+    return packed, tree, Huffman.build_decode_lut(canonical)
+
+
+# Counts doubling every 32 byte values give codes longer than LUT_BITS
+_SKEWED = "".join(chr(i) * 2 ** (i // 32) for i in range(256))
+
+
+@pytest.mark.parametrize(
+    "message", [_SKEWED, "AAAA", "HELLO WORLD"], ids=["skewed", "single", "hello"]
+)
+def test_lut_round_trip(message):
+    packed, tree, lut = _packed(message)
+    assert Huffman.decode_with_lut(packed, len(message), lut) == message
+    assert Huffman.decode_packed_lut(packed, len(message), lut) == message
+
+
+@pytest.mark.parametrize(
+    "message", [_SKEWED, "AAAA", "HELLO WORLD"], ids=["skewed", "single", "hello"]
+)
+def test_tree_round_trip(message):
+    _, tree, _ = _packed(message)
+    table = Huffman.build_encoding_table(tree)
+    encoded = Huffman.encode_with_table(message, table)
+    packed, _ = Huffman.encode_packed(message, Huffman.build_code_table(tree))
+    assert Huffman.decode_with_table(encoded, Huffman.build_reverse_table(table)) == message
+    assert Huffman.decode_with_tree(encoded, tree) == message
+    assert Huffman.pack_bits(encoded) == packed
+    assert Huffman.decode_packed(packed, len(message), tree) == message
+
+
+def test_skewed_alphabet_uses_continuation_blocks():
+    _, tree, lut = _packed(_SKEWED)
+    longest = max(length for _, length in Huffman.build_code_table(tree).values())
+    assert longest > Huffman.LUT_BITS
+    assert len(lut[0]) > Huffman.LUT_SIZE
+
+
+@pytest.mark.parametrize("decode", [Huffman.decode_with_lut, Huffman.decode_packed_lut])
+def test_lut_decoders_reject_truncated_input(decode):
+    packed, _, lut = _packed("HELLO WORLD")
+    with pytest.raises(ValueError):
+        decode(packed[:2], 6, lut)
+    with pytest.raises(ValueError):
+        decode(b"", 2_000_000, lut)
+
+
+def test_tree_decoder_rejects_truncated_input():
+    tree = Huffman.huffman(Huffman.create_forest(Huffman.frequency_of_symbols("HELLO WORLD")))
+    packed, _ = Huffman.encode_packed("HELLO WORLD", Huffman.build_code_table(tree))
+    with pytest.raises(ValueError):
+        Huffman.decode_packed(packed[:2], 6, tree)
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_packed_decoders_accept_bytes_like_input(wrap):
+    tree = Huffman.huffman(Huffman.create_forest(Huffman.frequency_of_symbols("HELLO WORLD")))
+    packed, _ = Huffman.encode_packed("HELLO WORLD", Huffman.build_code_table(tree))
+    assert Huffman.decode_packed(wrap(packed), 11, tree) == "HELLO WORLD"
+    canonical, _, lut = _packed("HELLO WORLD")
+    assert Huffman.decode_with_lut(wrap(canonical), 11, lut) == "HELLO WORLD"
+    assert Huffman.decode_packed_lut(wrap(canonical), 11, lut) == "HELLO WORLD"
+
+
+def test_c_decoder_rejects_leaf_root_and_non_int32_arrays():
+    huffman_decode = pytest.importorskip("huffman_decode")
+    leaf = np.array([-1], dtype=np.int32)
+    with pytest.raises(ValueError):
+        huffman_decode.decode(b"\0" * 4, 4, leaf, leaf, np.array([65], dtype=np.int32), 0)
+    children = np.array([1, 0], dtype=np.int32)
+    with pytest.raises(TypeError):
+        huffman_decode.decode(
+            b"\0", 1, children.view(np.uint8), children, np.array([-1, 65], dtype=np.int32), 0
+        )